@@ -1,3 +1,4 @@
+import heapq
 from typing import List, Tuple, Optional
 
 from utils import is_valid_list_list_float
@@ -16,6 +17,11 @@ class Auction(object):
     EXCEPTION_BAD_FORMAT_RESERVE_PRICE = "Reserve should be a positive float!"
     EXCEPTION_BAD_FORMAT_LIST = "list_buyers_bids does not match expected " \
                                 "format: List[List[float]]!"
+    EXCEPTION_BAD_FORMAT_NB_SLOTS = "nb_slots should be a strictly positive " \
+                                    "int!"
+    EXCEPTION_BAD_FORMAT_SLOT_RESERVE_PRICES = "slot_reserve_prices should " \
+                                               "be a list of nb_slots " \
+                                               "positive floats!"
 
     def __init__(self, reserve_price: float,
                  list_buyers_bids: List[List[float]]):
@@ -173,3 +179,94 @@ class Auction(object):
                                                   sorted_list, winning_buyer)
 
         return winning_buyer, winning_price
+
+    def get_buyers_highest_bids(self) -> List[Tuple[int, float]]:
+        """
+        Return the highest bid of each buyer as a list of (buyer, bid) tuples,
+        in ascending order of the buyer index.
+        Buyers without any bid are skipped.
+
+        :return: List[Tuple[int, float]]
+        """
+        return [
+            (ind, max(sublist_bids))
+            for ind, sublist_bids in enumerate(self.list_buyers_bids)
+            if len(sublist_bids) > 0
+        ]
+
+    def get_ranked_buyers(self, nb_buyers: int) -> List[Tuple[int, float]]:
+        """
+        Return the nb_buyers distinct buyers with the highest bids, as
+        (buyer, highest bid) tuples in descending order of the bid (and
+        underlying descending order of the buyer index, so the highest index
+        wins in case of equality).
+        Uses a partial selection over the per-buyer highest bids instead of
+        sorting all the (buyer, bid) tuples.
+
+        :param nb_buyers: int, number of buyers to rank
+        :return: List[Tuple[int, float]]
+        """
+        return heapq.nlargest(nb_buyers, self.get_buyers_highest_bids(),
+                              key=lambda t: (t[1], t[0]))
+
+    def get_gsp_winners(self, nb_slots: int,
+                        slot_reserve_prices: Optional[List[float]] = None) \
+            -> List[Tuple[Optional[int], Optional[float]]]:
+        """
+        Return the winning buyer and price of each slot for a generalized
+        second-price (GSP) auction over nb_slots ranked slots.
+
+        Slots are allocated in order to the ranked buyers: the highest ranked
+        buyer not yet allocated wins the slot if its highest bid is greater or
+        equal to the slot reserve price. It pays the highest bid of the next
+        ranked buyer, or the slot reserve price if higher (or if there is no
+        such buyer).
+        Otherwise the slot has no winner, represented by (None, None), and the
+        buyer is carried forward to the next slots: with non-monotone slot
+        reserve prices, a lower ranked buyer never wins a slot while a higher
+        ranked buyer is left without one.
+
+        With nb_slots = 1, the result is [self.get_winners()].
+
+        :param nb_slots: int, number of slots to allocate
+        :param slot_reserve_prices: Optional[List[float]], reserve price of
+        each slot, defaults to self.reserve_price for all slots
+        :return: List[Tuple[Optional[int], Optional[float]]], index of the
+        winner and winning price for each slot
+        """
+        if not (isinstance(nb_slots, int) and not isinstance(nb_slots, bool)
+                and nb_slots > 0):
+            raise BadFormatException(Auction.EXCEPTION_BAD_FORMAT_NB_SLOTS)
+        if slot_reserve_prices is not None and \
+                not (isinstance(slot_reserve_prices, list)
+                     and len(slot_reserve_prices) == nb_slots
+                     and all(Auction.is_reserve_price_valid(r)
+                             for r in slot_reserve_prices)):
+            raise BadFormatException(
+                Auction.EXCEPTION_BAD_FORMAT_SLOT_RESERVE_PRICES)
+
+        # One more buyer than slots is needed to price the last slot
+        ranked_buyers = self.get_ranked_buyers(nb_slots + 1)
+
+        slot_winners = []
+        # Rank of the highest ranked buyer not yet allocated
+        rank = 0
+        # Slots after the last ranked buyer is allocated have no winner
+        for slot in range(nb_slots):
+            if rank >= len(ranked_buyers):
+                break
+            reserve_price = self.reserve_price
+            if slot_reserve_prices is not None:
+                reserve_price = slot_reserve_prices[slot]
+            winning_buyer, winning_price = None, None
+            if ranked_buyers[rank][1] >= reserve_price:
+                winning_buyer = ranked_buyers[rank][0]
+                winning_price = reserve_price
+                if rank + 1 < len(ranked_buyers):
+                    winning_price = max(reserve_price,
+                                        ranked_buyers[rank + 1][1])
+                rank += 1
+            slot_winners.append((winning_buyer, winning_price))
+        slot_winners.extend([(None, None)] * (nb_slots - len(slot_winners)))
+
+        return slot_winners
@@ -0,0 +1,132 @@
+"""
+Startup-time benchmark, per job:
+    - cold one-shot: `python teads-hw.py`, which clears the static, GSP and
+    dynamic example auctions
+    - cold job: the example job piped to a new `python teads-hw.py --worker`
+    - warm worker: the example job sent to a running worker
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import worker
+
+EXAMPLE_JOB = {
+    "reserve_price": 100.0,
+    "list_buyers_bids": [
+        [110.0, 130.0],
+        [],
+        [125.0],
+        [105.0, 115.0, 90.0],
+        [132.0, 135.0, 140.0]
+    ]
+}
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "teads-hw.py")
+STARTUP_TIMEOUT = 10.0
+
+
+def bench_cold(nb_runs: int) -> float:
+    """
+    Return the mean wall time (seconds) of a one-shot invocation of the
+    example script.
+
+    :param nb_runs: int
+    :return: float
+    """
+    start = time.perf_counter()
+    for _ in range(nb_runs):
+        subprocess.run([sys.executable, MAIN], check=True,
+                       stdout=subprocess.DEVNULL)
+    return (time.perf_counter() - start) / nb_runs
+
+
+def bench_cold_job(nb_runs: int) -> float:
+    """
+    Return the mean wall time (seconds) of a new worker clearing the example
+    job piped on stdin.
+
+    :param nb_runs: int
+    :return: float
+    """
+    job = json.dumps(EXAMPLE_JOB).encode() + b"\n"
+    start = time.perf_counter()
+    for _ in range(nb_runs):
+        subprocess.run([sys.executable, MAIN, "--worker"], check=True,
+                       input=job, stdout=subprocess.DEVNULL)
+    return (time.perf_counter() - start) / nb_runs
+
+
+def wait_for_worker(process: subprocess.Popen, socket_path: str) -> None:
+    """
+    Wait until the worker accepts connections on socket_path.
+    Raise RuntimeError if the worker exits or does not accept connections
+    within STARTUP_TIMEOUT seconds.
+
+    :param process: subprocess.Popen, worker process
+    :param socket_path: str
+    :return:
+    """
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(
+                "Worker exited with status {}".format(process.returncode))
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(socket_path)
+                return
+            except (FileNotFoundError, ConnectionRefusedError):
+                time.sleep(0.01)
+    raise RuntimeError("Worker did not start within {} seconds".format(
+        STARTUP_TIMEOUT))
+
+
+def bench_warm(nb_runs: int) -> float:
+    """
+    Return the mean wall time (seconds) of a job sent to a warm worker, one
+    connection per job. The worker startup is not measured.
+
+    :param nb_runs: int
+    :return: float
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socket_path = os.path.join(tmp_dir, "worker.sock")
+        process = subprocess.Popen(
+            [sys.executable, MAIN, "--worker", "--socket", socket_path])
+        try:
+            wait_for_worker(process, socket_path)
+            # Distinct jobs, so the worker result cache is not hit
+            jobs = [
+                dict(EXAMPLE_JOB, reserve_price=100.0 + i)
+                for i in range(nb_runs)
+            ]
+            start = time.perf_counter()
+            for job in jobs:
+                worker.submit(socket_path, [job])
+            return (time.perf_counter() - start) / nb_runs
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nb-runs", type=int, default=20)
+    args = parser.parse_args()
+
+    cold = bench_cold(args.nb_runs)
+    cold_job = bench_cold_job(args.nb_runs)
+    warm = bench_warm(args.nb_runs)
+    print(">> Cold one-shot (whole example script): {:.2f} ms per run".format(
+        cold * 1000))
+    print(">> Cold job (example job piped to a new worker): {:.2f} ms per "
+          "job".format(cold_job * 1000))
+    print(">> Warm worker (example job): {:.2f} ms per job".format(
+        warm * 1000))
+    print(">> Speedup (cold job / warm worker): x{:.1f}".format(
+        cold_job / warm))
@@ -1,7 +1,14 @@
+import sys
+
 from auction import Auction
 from dynamic_auction import DynamicAuction, Bid
 
 if __name__ == '__main__':
+    if "--worker" in sys.argv[1:]:
+        # Imported lazily so one-shot runs do not pay for the worker imports
+        import worker
+        sys.exit(worker.main(sys.argv[1:]))
+
     print("""\nStatic implementation: compute the result at the end of the auction based on the entire description of the auction.""")
     auction = Auction(
         100.0,
@@ -24,6 +31,17 @@ if __name__ == '__main__':
             auction.reserve_price
         ))
 
+    # Compute winners of a 3-slot generalized second-price auction
+    for slot, (winning_buyer, winning_price) in enumerate(
+            auction.get_gsp_winners(3)):
+        print(
+            ">> Buyer #{} won the slot #{} "
+            "with the price {}".format(
+                winning_buyer,
+                slot,
+                winning_price
+            ))
+
     print("""\n\nDynamic implementation of the auction""")
     # Init the auction
     dynamic_auction = DynamicAuction(
@@ -243,5 +243,122 @@ class AuctionTest(unittest.TestCase):
             "Winner price should be None with None winner"
         )
 
+    def test_get_ranked_buyers(self):
+        """Check buyers are ranked on their highest bid, with the highest
+        index first in case of equality"""
+        auction = Auction(1.0, [
+            [5.0, 1.0],
+            [],
+            [3.0],
+            [1.0, 5.0],
+            [4.0, 2.0]
+        ])
+        self.assertEqual(
+            auction.get_ranked_buyers(3),
+            [(3, 5.0), (0, 5.0), (4, 4.0)],
+            "Buyers ranking is not valid"
+        )
+        self.assertEqual(
+            len(auction.get_ranked_buyers(10)),
+            4,
+            "Buyers without bid should not be ranked"
+        )
+
+    def test_get_gsp_winners(self):
+        """Check each slot winner pays the next ranked buyer highest bid, or
+        the reserve price if higher"""
+        auction = Auction(100.0, [
+            [110.0, 130.0],
+            [],
+            [125.0],
+            [105.0, 115.0, 90.0],
+            [132.0, 135.0, 140.0]
+        ])
+        self.assertEqual(
+            auction.get_gsp_winners(3),
+            [(4, 130.0), (0, 125.0), (2, 115.0)],
+            "GSP winners are not valid"
+        )
+        self.assertEqual(
+            auction.get_gsp_winners(5),
+            [(4, 130.0), (0, 125.0), (2, 115.0), (3, 100.0), (None, None)],
+            "GSP winners are not valid"
+        )
+
+    def test_get_gsp_winners_more_slots_than_buyers(self):
+        """Check slots after the last ranked buyer have no winner"""
+        auction = Auction(1.0, [[2.0], [], [3.0]])
+        slot_winners = auction.get_gsp_winners(10 ** 6)
+        self.assertEqual(len(slot_winners), 10 ** 6,
+                         "There should be one result per slot")
+        self.assertEqual(slot_winners[:3],
+                         [(2, 2.0), (0, 1.0), (None, None)],
+                         "GSP winners are not valid")
+        self.assertEqual(set(slot_winners[2:]), {(None, None)},
+                         "Slots without buyer should have no winner")
+
+    def test_get_gsp_winners_single_slot(self):
+        """Check GSP with a single slot reduces to get_winners"""
+        for auction in [
+            Auction(100.0, [[110.0, 130.0], [], [125.0], [140.0]]),
+            Auction(2.0, [[5.0], [1.0, 5.0], [2.0], [1.0, 5.0], [3.0]]),
+            Auction(2.0, [[1.0], [1.0, 1.4]]),
+            Auction(2.0, [[1.0, 5.0]]),
+            Auction(2.0, [])
+        ]:
+            self.assertEqual(
+                auction.get_gsp_winners(1),
+                [auction.get_winners()],
+                "GSP with 1 slot should match get_winners"
+            )
+
+    def test_get_gsp_winners_slot_reserve_prices(self):
+        """Check per-slot reserve prices are used as floor of each slot"""
+        auction = Auction(100.0, [
+            [110.0, 130.0],
+            [],
+            [125.0],
+            [105.0, 115.0, 90.0],
+            [132.0, 135.0, 140.0]
+        ])
+        self.assertEqual(
+            auction.get_gsp_winners(3, [135.0, 120.0, 130.0]),
+            [(4, 135.0), (0, 125.0), (None, None)],
+            "GSP winners are not valid with slot reserve prices"
+        )
+
+    def test_get_gsp_winners_non_monotone_slot_reserve_prices(self):
+        """Check a buyer failing a slot reserve price is carried forward to
+        the next slots"""
+        auction = Auction(100.0, [[300.0], [250.0], [150.0], [120.0]])
+        self.assertEqual(
+            auction.get_gsp_winners(3, [100.0, 300.0, 100.0]),
+            [(0, 250.0), (None, None), (1, 150.0)],
+            "Unallocated buyer should be carried forward"
+        )
+
+    def test_get_gsp_winners_raises_exceptions(self):
+        """Check exceptions are raised when GSP parameters are invalid"""
+        auction = Auction(1.0, [[1.0], [2.0]])
+        with self.assertRaises(BadFormatException) as e:
+            auction.get_gsp_winners(0)
+        self.assertEqual(e.exception.args[0],
+                         Auction.EXCEPTION_BAD_FORMAT_NB_SLOTS)
+
+        with self.assertRaises(BadFormatException) as e:
+            auction.get_gsp_winners(True)
+        self.assertEqual(e.exception.args[0],
+                         Auction.EXCEPTION_BAD_FORMAT_NB_SLOTS)
+
+        with self.assertRaises(BadFormatException) as e:
+            auction.get_gsp_winners(2, [1.0])
+        self.assertEqual(e.exception.args[0],
+                         Auction.EXCEPTION_BAD_FORMAT_SLOT_RESERVE_PRICES)
+
+        with self.assertRaises(BadFormatException) as e:
+            auction.get_gsp_winners(2, [1.0, -1.0])
+        self.assertEqual(e.exception.args[0],
+                         Auction.EXCEPTION_BAD_FORMAT_SLOT_RESERVE_PRICES)
+
 if __name__ == '__main__':
     unittest.main()
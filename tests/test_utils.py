@@ -1,6 +1,8 @@
+import json
 import unittest
 
-from utils import is_valid_list_list_float
+from utils import is_valid_list_list_float, is_valid_int, is_valid_number, \
+    import_optional
 
 
 class UtilsTest(unittest.TestCase):
@@ -26,6 +28,27 @@ class UtilsTest(unittest.TestCase):
         self.assertTrue(is_valid_list_list_float([[1.0, 2.0], [2.0]]),
                         "List should be invalid")
 
+    def test_is_valid_int(self):
+        """Test utils method is_valid_int"""
+        self.assertTrue(is_valid_int(1), "Int should be valid")
+        self.assertFalse(is_valid_int(True), "Bool should be invalid")
+        self.assertFalse(is_valid_int(1.0), "Float should be invalid")
+        self.assertFalse(is_valid_int(None), "None should be invalid")
+
+    def test_is_valid_number(self):
+        """Test utils method is_valid_number"""
+        self.assertTrue(is_valid_number(1), "Int should be valid")
+        self.assertTrue(is_valid_number(1.5), "Float should be valid")
+        self.assertFalse(is_valid_number(True), "Bool should be invalid")
+        self.assertFalse(is_valid_number("1"), "String should be invalid")
+
+    def test_import_optional(self):
+        """Test utils method import_optional"""
+        self.assertIs(import_optional("json"), json,
+                      "Installed module should be returned")
+        self.assertIsNone(import_optional("not_an_installed_module"),
+                          "Missing module should return None")
+
 
 if __name__ == '__main__':
     unittest.main()
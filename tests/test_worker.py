@@ -0,0 +1,193 @@
+import io
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+
+from worker import MAX_NB_SLOTS, clear_job, handle_line, serve_pipe, serve_socket, \
+    remove_stale_socket, submit, JobHandler, WorkerServer, WorkerException
+
+EXAMPLE_JOB = {
+    "reserve_price": 100.0,
+    "list_buyers_bids": [
+        [110.0, 130.0],
+        [],
+        [125.0],
+        [105.0, 115.0, 90.0],
+        [132.0, 135.0, 140.0]
+    ]
+}
+
+
+class WorkerTest(unittest.TestCase):
+    """
+    Test suite for the worker jobs protocol.
+    """
+
+    def test_clear_job(self):
+        """Check single winner and GSP jobs are cleared"""
+        self.assertEqual(
+            clear_job(EXAMPLE_JOB),
+            {"winning_buyer": 4, "winning_price": 130.0},
+            "Job result is not valid"
+        )
+        self.assertEqual(
+            clear_job(dict(EXAMPLE_JOB, nb_slots=2)),
+            {"slot_winners": [[4, 130.0], [0, 125.0]]},
+            "GSP job result is not valid"
+        )
+
+    def test_clear_job_slot_reserve_prices(self):
+        """Check the number of slots defaults to the number of slot reserve
+        prices"""
+        self.assertEqual(
+            clear_job({"reserve_price": 1.0, "list_buyers_bids": [[2.0]],
+                       "slot_reserve_prices": [5.0]}),
+            {"slot_winners": [[None, None]]},
+            "Slot reserve prices should not be ignored"
+        )
+        self.assertEqual(
+            clear_job(dict(EXAMPLE_JOB, slot_reserve_prices=[135.0, 100.0])),
+            {"slot_winners": [[4, 135.0], [0, 125.0]]},
+            "GSP job result is not valid"
+        )
+
+    def test_handle_line_error(self):
+        """Check invalid jobs return an error instead of raising"""
+        for line in [b"not json",
+                     b"{}",
+                     b"\xff\xfe\xfd",
+                     json.dumps(dict(EXAMPLE_JOB, reserve_price=100)).encode(),
+                     json.dumps(dict(EXAMPLE_JOB, nb_slots=0)).encode(),
+                     json.dumps(dict(EXAMPLE_JOB, nb_slots=True)).encode(),
+                     json.dumps(dict(EXAMPLE_JOB,
+                                     nb_slots=MAX_NB_SLOTS + 1)).encode(),
+                     json.dumps(dict(EXAMPLE_JOB,
+                                     slot_reserve_prices=100.0)).encode()]:
+            self.assertIn("error", json.loads(handle_line(line)),
+                          "Invalid job should return an error")
+
+    def test_serve_pipe_survives_failing_jobs(self):
+        """Check jobs raising RecursionError or too large for the memory get
+        an error line, and the jobs queued after them are answered"""
+        input_file = io.BytesIO(
+            b"[" * 100000 + b"\n" +
+            json.dumps({"reserve_price": 1.0, "list_buyers_bids": [[2.0]],
+                        "nb_slots": 10 ** 12}).encode() + b"\n" +
+            json.dumps(EXAMPLE_JOB).encode() + b"\n")
+        output_file = io.BytesIO()
+        serve_pipe(input_file, output_file)
+        results = [json.loads(line)
+                   for line in output_file.getvalue().splitlines()]
+        self.assertEqual(len(results), 3, "Every job should be answered")
+        self.assertIn("RecursionError", results[0]["error"],
+                      "Nested JSON should return an error")
+        self.assertIn("error", results[1],
+                      "Too many slots should return an error")
+        self.assertEqual(results[2],
+                         {"winning_buyer": 4, "winning_price": 130.0},
+                         "Following job should be cleared")
+
+    def test_serve_pipe(self):
+        """Check jobs read from the input are answered in order"""
+        input_file = io.BytesIO(
+            json.dumps(EXAMPLE_JOB).encode() + b"\n\n\xff\n" +
+            json.dumps(dict(EXAMPLE_JOB, nb_slots=1)).encode() + b"\n")
+        output_file = io.BytesIO()
+        serve_pipe(input_file, output_file)
+        self.assertEqual(
+            [json.loads(line) for line in output_file.getvalue().splitlines()],
+            [{"winning_buyer": 4, "winning_price": 130.0},
+             {"error": "UnicodeDecodeError: 'utf-8' codec can't decode byte "
+                       "0xff in position 0: invalid start byte"},
+             {"slot_winners": [[4, 130.0]]}],
+            "Pipe results are not valid"
+        )
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets required")
+    def test_serve_socket(self):
+        """Check jobs submitted over a Unix socket are answered in order"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            socket_path = os.path.join(tmp_dir, "worker.sock")
+            with WorkerServer(socket_path, JobHandler) as server:
+                thread = threading.Thread(target=server.serve_forever)
+                thread.start()
+                try:
+                    self.assertEqual(
+                        submit(socket_path,
+                               [EXAMPLE_JOB, dict(EXAMPLE_JOB, nb_slots=1)]),
+                        [{"winning_buyer": 4, "winning_price": 130.0},
+                         {"slot_winners": [[4, 130.0]]}],
+                        "Socket results are not valid"
+                    )
+                finally:
+                    server.shutdown()
+                    thread.join()
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets required")
+    def test_serve_socket_invalid_utf8(self):
+        """Check a non UTF-8 line sent over a Unix socket gets an error line
+        and keeps the connection open"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            socket_path = os.path.join(tmp_dir, "worker.sock")
+            with WorkerServer(socket_path, JobHandler) as server:
+                thread = threading.Thread(target=server.serve_forever)
+                thread.start()
+                try:
+                    with socket.socket(socket.AF_UNIX,
+                                       socket.SOCK_STREAM) as client:
+                        client.connect(socket_path)
+                        with client.makefile("rwb") as stream:
+                            stream.write(b"\xff\n")
+                            stream.write(json.dumps(EXAMPLE_JOB).encode()
+                                         + b"\n")
+                            stream.flush()
+                            self.assertIn("error",
+                                          json.loads(stream.readline()),
+                                          "Invalid line should get an error")
+                            self.assertEqual(
+                                json.loads(stream.readline()),
+                                {"winning_buyer": 4, "winning_price": 130.0},
+                                "Connection should stay open"
+                            )
+                finally:
+                    server.shutdown()
+                    thread.join()
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets required")
+    def test_serve_socket_stale_socket(self):
+        """Check a stale socket file, left by a killed worker, is replaced"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            socket_path = os.path.join(tmp_dir, "worker.sock")
+            # Bound but never listening, as left by a killed worker
+            stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            stale.bind(socket_path)
+            stale.close()
+
+            remove_stale_socket(socket_path)
+            self.assertFalse(os.path.exists(socket_path),
+                             "Stale socket should be removed")
+            with WorkerServer(socket_path, JobHandler):
+                self.assertTrue(os.path.exists(socket_path),
+                                "Socket path should be bound again")
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets required")
+    def test_serve_socket_raises_exceptions(self):
+        """Check WorkerException is raised when the socket path is in use"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            socket_path = os.path.join(tmp_dir, "worker.sock")
+            with WorkerServer(socket_path, JobHandler):
+                with self.assertRaises(WorkerException):
+                    serve_socket(socket_path)
+            os.remove(socket_path)
+
+            # The path is a regular file
+            open(socket_path, "w").close()
+            with self.assertRaises(WorkerException):
+                serve_socket(socket_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
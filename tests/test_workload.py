@@ -0,0 +1,249 @@
+import io
+import json
+import unittest
+from collections import Counter
+
+from auction import Auction
+from utils import import_optional
+from workload import WorkloadGenerator, BadFormatException
+
+
+def count_cross_buyer_ties(auction_ids, buyer_ids, bids) -> int:
+    """
+    Return the number of bids sharing their value with a bid from another
+    buyer of the same auction.
+    """
+    buyers_per_value = {}
+    for auction_id, buyer_id, bid in zip(auction_ids, buyer_ids, bids):
+        buyers_per_value.setdefault((auction_id, bid), set()).add(buyer_id)
+    return sum(
+        1 for auction_id, buyer_id, bid in zip(auction_ids, buyer_ids, bids)
+        if len(buyers_per_value[(auction_id, bid)]) > 1
+    )
+
+
+class WorkloadGeneratorTest(unittest.TestCase):
+    """
+    Test suite for the WorkloadGenerator class.
+    """
+
+    def test_constructor_raises_exceptions(self):
+        """Check exceptions are raised when at least one parameter is invalid"""
+        with self.assertRaises(BadFormatException):
+            WorkloadGenerator(reserve_price=100)
+
+        with self.assertRaises(BadFormatException):
+            WorkloadGenerator(max_buyers=0)
+
+        with self.assertRaises(BadFormatException):
+            WorkloadGenerator(buyers_distribution="normal")
+
+        with self.assertRaises(BadFormatException):
+            WorkloadGenerator(tie_ratio=1.5)
+
+        with self.assertRaises(BadFormatException):
+            WorkloadGenerator(tie_ratio="0.5")
+
+        with self.assertRaises(BadFormatException):
+            WorkloadGenerator(max_buyers=True)
+
+        with self.assertRaises(BadFormatException):
+            WorkloadGenerator(max_bids_per_buyer=0)
+
+        with self.assertRaises(BadFormatException):
+            WorkloadGenerator(bid_precision=-1)
+
+        with self.assertRaises(BadFormatException):
+            WorkloadGenerator(bid_precision=2.0)
+
+        with self.assertRaises(BadFormatException):
+            WorkloadGenerator(empty_buyer_ratio=-0.1)
+
+    def test_get_count_distribution(self):
+        """Check population and cumulative weights of count distributions"""
+        self.assertEqual(
+            WorkloadGenerator.get_count_distribution("uniform", 0, 2, 1.0),
+            ([0, 1, 2], [1.0, 2.0, 3.0]),
+            "Uniform distribution is not valid"
+        )
+        self.assertEqual(
+            WorkloadGenerator.get_count_distribution("zipf", 1, 3, 1.0),
+            ([1, 2, 3], [1.0, 1.5, 1.5 + 1 / 3]),
+            "Zipf distribution is not valid"
+        )
+
+    def test_generate_auction_is_deterministic(self):
+        """Check two generators with the same seed generate the same auctions"""
+        auctions_1 = WorkloadGenerator(seed=42).generate_auctions(20)
+        auctions_2 = WorkloadGenerator(seed=42).generate_auctions(20)
+        for auction_1, auction_2 in zip(auctions_1, auctions_2):
+            self.assertEqual(auction_1.list_buyers_bids,
+                             auction_2.list_buyers_bids,
+                             "Auctions should be equal with the same seed")
+
+    def test_generate_auction_bounds(self):
+        """Check generated auctions respect the count bounds"""
+        generator = WorkloadGenerator(max_buyers=4, max_bids_per_buyer=3)
+        for auction in generator.generate_auctions(100):
+            self.assertIsInstance(auction, Auction)
+            self.assertTrue(1 <= len(auction.list_buyers_bids) <= 4,
+                            "Number of buyers is out of bounds")
+            for sublist_bids in auction.list_buyers_bids:
+                self.assertTrue(len(sublist_bids) <= 3,
+                                "Number of bids is out of bounds")
+                for bid in sublist_bids:
+                    self.assertGreater(bid, 0.0, "Bid should be positive")
+
+    def test_empty_buyer_ratio(self):
+        """Check buyers place no bid only with probability empty_buyer_ratio,
+        whatever the bids distribution"""
+        for distribution in WorkloadGenerator.COUNT_DISTRIBUTIONS:
+            generator = WorkloadGenerator(bids_distribution=distribution,
+                                          empty_buyer_ratio=0.0)
+            for auction in generator.generate_auctions(100):
+                self.assertTrue(
+                    all(len(bids) > 0 for bids in auction.list_buyers_bids),
+                    "Every buyer should place bids"
+                )
+
+        generator = WorkloadGenerator(bids_distribution="zipf",
+                                      empty_buyer_ratio=0.2)
+        nb_bids = Counter(
+            len(bids)
+            for auction in generator.generate_auctions(2000)
+            for bids in auction.list_buyers_bids
+        )
+        ratio = nb_bids[0] / sum(nb_bids.values())
+        self.assertTrue(0.15 < ratio < 0.25,
+                        "Empty buyers ratio {} should be close to 0.2".format(
+                            ratio))
+        self.assertGreater(nb_bids[1], nb_bids[2],
+                           "Zipf should favour buyers with 1 bid")
+
+    def test_tie_injection(self):
+        """Check injected ties are between bids of different buyers"""
+        generator = WorkloadGenerator(bid_precision=6, tie_ratio=0.0)
+        columns = generator.generate_columns(200, vectorized=False)
+        self.assertEqual(count_cross_buyer_ties(*columns), 0,
+                         "There should be no tie without injection")
+
+        generator = WorkloadGenerator(bid_precision=6, tie_ratio=0.3)
+        columns = generator.generate_columns(200, vectorized=False)
+        self.assertGreater(count_cross_buyer_ties(*columns), 0,
+                           "There should be ties between buyers")
+
+    def test_tie_injection_single_buyer(self):
+        """Check bids of a single buyer auction are never tied"""
+        generator = WorkloadGenerator(max_buyers=1, max_bids_per_buyer=5,
+                                      empty_buyer_ratio=0.0, bid_precision=6,
+                                      tie_ratio=1.0)
+        for auction in generator.generate_auctions(20):
+            bids = auction.list_buyers_bids[0]
+            self.assertEqual(len(set(bids)), len(bids),
+                             "Bids of a single buyer should not be tied")
+
+    def test_generate_columns(self):
+        """Check columnar arrays match the generated auctions"""
+        auctions = list(WorkloadGenerator(seed=1).generate_auctions(10))
+        auction_ids, buyer_ids, bids = \
+            WorkloadGenerator(seed=1).generate_columns(10, vectorized=False)
+        self.assertEqual(
+            list(zip(auction_ids, buyer_ids, bids)),
+            [
+                (auction_id, buyer_id, bid)
+                for auction_id, auction in enumerate(auctions)
+                for buyer_id, bid in auction.get_flat_list_tuples()
+            ],
+            "Columns do not match the generated auctions"
+        )
+
+    @unittest.skipIf(import_optional("numpy") is None, "numpy required")
+    def test_generate_columns_vectorized(self):
+        """Check vectorized columns are deterministic and respect the count
+        bounds"""
+        generator = WorkloadGenerator(seed=1, max_buyers=4,
+                                      max_bids_per_buyer=3)
+        auction_ids, buyer_ids, bids = generator.generate_columns(
+            1000, vectorized=True)
+        columns = WorkloadGenerator(seed=1, max_buyers=4,
+                                    max_bids_per_buyer=3).generate_columns(
+            1000, vectorized=True)
+        for column_1, column_2 in zip((auction_ids, buyer_ids, bids),
+                                      columns):
+            self.assertEqual(column_1.tolist(), column_2.tolist(),
+                             "Columns should be equal with the same seed")
+
+        self.assertTrue((auction_ids[1:] >= auction_ids[:-1]).all(),
+                        "Rows should be ordered by auction")
+        self.assertTrue(0 <= auction_ids.min() and auction_ids.max() < 1000,
+                        "Auction index is out of bounds")
+        self.assertTrue(0 <= buyer_ids.min() and buyer_ids.max() < 4,
+                        "Buyer index is out of bounds")
+        self.assertLessEqual(
+            max(Counter(zip(auction_ids.tolist(),
+                            buyer_ids.tolist())).values()),
+            3,
+            "Number of bids is out of bounds"
+        )
+        self.assertTrue((bids > 0).all(), "Bid should be positive")
+
+    @unittest.skipIf(import_optional("numpy") is None, "numpy required")
+    def test_tie_injection_vectorized(self):
+        """Check vectorized ties are between bids of different buyers"""
+        generator = WorkloadGenerator(bid_precision=6, tie_ratio=0.0)
+        columns = generator.generate_columns(200, vectorized=True)
+        self.assertEqual(count_cross_buyer_ties(*columns), 0,
+                         "There should be no tie without injection")
+
+        generator = WorkloadGenerator(bid_precision=6, tie_ratio=0.3)
+        columns = generator.generate_columns(200, vectorized=True)
+        self.assertGreater(count_cross_buyer_ties(*columns), 0,
+                           "There should be ties between buyers")
+
+        generator = WorkloadGenerator(max_buyers=1, bid_precision=6,
+                                      tie_ratio=1.0)
+        auction_ids, buyer_ids, bids = generator.generate_columns(
+            200, vectorized=True)
+        self.assertEqual(
+            len(set(zip(auction_ids.tolist(), bids.tolist()))),
+            len(bids),
+            "Bids of a single buyer should not be tied"
+        )
+
+    def test_write_jsonl(self):
+        """Check each JSONL line can be loaded as an Auction"""
+        file = io.StringIO()
+        WorkloadGenerator(seed=1).write_jsonl(10, file)
+        lines = file.getvalue().splitlines()
+        self.assertEqual(len(lines), 10, "There should be one line per auction")
+
+        auctions = WorkloadGenerator(seed=1).generate_auctions(10)
+        for line, auction in zip(lines, auctions):
+            record = json.loads(line)
+            self.assertEqual(
+                Auction(record["reserve_price"],
+                        record["list_buyers_bids"]).list_buyers_bids,
+                auction.list_buyers_bids,
+                "JSONL line does not match the generated auction"
+            )
+
+    def test_generate_bid_stream(self):
+        """Check the stream is ordered by timestamp and holds all the bids"""
+        generator = WorkloadGenerator(seed=3, max_buyers=20)
+        auction = generator.generate_auction()
+        stream = generator.generate_bid_stream(auction, start_time=10.0)
+
+        timestamps = [timestamp for timestamp, _ in stream]
+        self.assertEqual(timestamps, sorted(timestamps),
+                         "Stream should be ordered by timestamp")
+        self.assertTrue(all(timestamp > 10.0 for timestamp in timestamps),
+                        "Stream should start after start_time")
+        self.assertEqual(
+            sorted((bid.buyer_id, bid.bid_value) for _, bid in stream),
+            sorted(auction.get_flat_list_tuples()),
+            "Stream should hold all the bids of the auction"
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 """
 Tools
 """
+import importlib
+
 
 def is_valid_list_list_float(list_list_float) -> bool:
     """
@@ -23,3 +25,36 @@ def is_valid_list_list_float(list_list_float) -> bool:
                 ]
             )
     )
+
+
+def is_valid_int(value) -> bool:
+    """
+    Return True if value is an int, bool excluded.
+
+    :return: bool
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def is_valid_number(value) -> bool:
+    """
+    Return True if value is an int or a float, bool excluded.
+
+    :return: bool
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def import_optional(module_name: str):
+    """
+    Import an optional dependency on first use, so heavy backends are only
+    loaded when needed.
+    Return None if the module is not installed.
+
+    :param module_name: str
+    :return: the module, or None
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        return None
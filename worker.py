@@ -0,0 +1,210 @@
+"""
+Long-lived worker clearing auction jobs, to avoid paying the interpreter
+startup and imports for each job.
+
+Jobs and results are exchanged as JSON lines, either over stdin / stdout (pipe
+mode) or over a Unix socket. A job is:
+
+    {"reserve_price": float, "list_buyers_bids": List[List[float]]}
+
+with the optional "nb_slots" (int) and "slot_reserve_prices" (List[float])
+keys to clear a generalized second-price auction.
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+from functools import lru_cache
+from typing import List, BinaryIO, Optional
+
+from auction import Auction, BadFormatException
+from utils import is_valid_int
+
+# Maximum number of slots of a job, so a single job cannot exhaust the memory
+# of the resident worker
+MAX_NB_SLOTS = 1024
+
+
+class WorkerException(Exception):
+    pass
+
+
+def clear_job(job: dict) -> dict:
+    """
+    Clear the auction described by the job.
+    Returns {"winning_buyer": ..., "winning_price": ...}, or
+    {"slot_winners": [[buyer, price], ...]} when "nb_slots" or
+    "slot_reserve_prices" is given. Without "nb_slots", the number of slots is
+    the number of slot reserve prices.
+    Raise BadFormatException if the number of slots exceeds MAX_NB_SLOTS.
+
+    :param job: dict
+    :return: dict
+    """
+    auction = Auction(job["reserve_price"], job["list_buyers_bids"])
+    nb_slots = job.get("nb_slots")
+    slot_reserve_prices = job.get("slot_reserve_prices")
+    if nb_slots is None and slot_reserve_prices is not None:
+        if not isinstance(slot_reserve_prices, list):
+            raise BadFormatException(
+                Auction.EXCEPTION_BAD_FORMAT_SLOT_RESERVE_PRICES)
+        nb_slots = len(slot_reserve_prices)
+    if nb_slots is None:
+        winning_buyer, winning_price = auction.get_winners()
+        return {"winning_buyer": winning_buyer, "winning_price": winning_price}
+    if is_valid_int(nb_slots) and nb_slots > MAX_NB_SLOTS:
+        raise BadFormatException(
+            "nb_slots should not exceed {}!".format(MAX_NB_SLOTS))
+    return {
+        "slot_winners": [
+            list(slot_winner) for slot_winner in auction.get_gsp_winners(
+                nb_slots, slot_reserve_prices)
+        ]
+    }
+
+
+@lru_cache(maxsize=1024)
+def handle_line(line: bytes) -> bytes:
+    """
+    Clear the JSON job of the line and return the JSON result.
+    Any error raised by a job (invalid job, non UTF-8 line, too deeply nested
+    JSON, ...) returns {"error": message} instead of stopping the worker.
+    Results are cached, as identical jobs have identical results.
+
+    :param line: bytes, JSON job
+    :return: bytes, JSON result
+    """
+    try:
+        result = clear_job(json.loads(line))
+    # A single job should never take down the resident worker
+    except Exception as e:
+        result = {"error": "{}: {}".format(type(e).__name__, e)}
+    return json.dumps(result).encode()
+
+
+def serve_pipe(input_file: BinaryIO, output_file: BinaryIO) -> None:
+    """
+    Clear the jobs read from input_file, one per line, and write the results to
+    output_file in the same order, until input_file is closed.
+
+    :param input_file: BinaryIO
+    :param output_file: BinaryIO
+    :return:
+    """
+    for line in input_file:
+        if line.strip():
+            output_file.write(handle_line(line.strip()) + b"\n")
+            output_file.flush()
+
+
+class JobHandler(socketserver.StreamRequestHandler):
+    """
+    Clear the jobs sent over a connection, one per line, until the client
+    closes it.
+    """
+
+    def handle(self) -> None:
+        serve_pipe(self.rfile, self.wfile)
+
+
+class WorkerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix socket server clearing jobs, one thread per connection.
+    """
+    daemon_threads = True
+
+
+def remove_stale_socket(socket_path: str) -> None:
+    """
+    Remove the socket file left by a worker that did not exit cleanly (e.g.
+    killed by SIGKILL), so the path can be bound again.
+    Raise WorkerException if the path is not a socket, or if a worker is still
+    listening on it.
+
+    :param socket_path: str
+    :return:
+    """
+    if not os.path.exists(socket_path):
+        return
+    if not stat.S_ISSOCK(os.stat(socket_path).st_mode):
+        raise WorkerException(
+            "{} already exists and is not a socket.".format(socket_path))
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except ConnectionRefusedError:
+            os.remove(socket_path)
+            return
+    raise WorkerException(
+        "A worker is already listening on {}.".format(socket_path))
+
+
+def serve_socket(socket_path: str) -> None:
+    """
+    Serve jobs on a Unix socket until interrupted.
+    A stale socket file is replaced, and the socket file is removed on exit.
+
+    :param socket_path: str, path of the Unix socket to create
+    :return:
+    """
+    remove_stale_socket(socket_path)
+    with WorkerServer(socket_path, JobHandler) as server:
+        try:
+            server.serve_forever()
+        finally:
+            os.remove(socket_path)
+
+
+def submit(socket_path: str, jobs: List[dict]) -> List[dict]:
+    """
+    Send jobs to a worker listening on socket_path and return the results.
+
+    :param socket_path: str
+    :param jobs: List[dict]
+    :return: List[dict]
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        with client.makefile("rw") as stream:
+            results = []
+            for job in jobs:
+                stream.write(json.dumps(job) + "\n")
+                stream.flush()
+                results.append(json.loads(stream.readline()))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the worker from the command line, return the exit status.
+
+    :param argv: Optional[List[str]], command line arguments, defaults to
+    sys.argv[1:]
+    :return: int
+    """
+    parser = argparse.ArgumentParser(
+        description="Start a long-lived worker clearing JSON line jobs.")
+    parser.add_argument("--worker", action="store_true",
+                        help="clear jobs read from stdin, or from --socket")
+    parser.add_argument("--socket",
+                        help="Unix socket path the worker listens on")
+    args = parser.parse_args(argv)
+
+    if args.socket is None:
+        serve_pipe(sys.stdin.buffer, sys.stdout.buffer)
+        return 0
+
+    # Exit cleanly on SIGTERM so the socket file is removed
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        serve_socket(args.socket)
+    except KeyboardInterrupt:
+        pass
+    except WorkerException as e:
+        print("worker: {}".format(e), file=sys.stderr)
+        return 1
+    return 0
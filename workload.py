@@ -0,0 +1,462 @@
+"""
+Deterministic synthetic workload generator, used to load test the auction
+clearing at scale.
+"""
+import argparse
+import json
+import random
+import sys
+from array import array
+from itertools import accumulate
+from typing import List, Tuple, Iterator, TextIO, Optional, Sequence
+
+from auction import Auction
+from dynamic_auction import Bid
+from utils import is_valid_int, is_valid_number, import_optional
+
+
+class BadFormatException(Exception):
+    pass
+
+
+class WorkloadGenerator(object):
+    """
+    Class generating seeded synthetic auctions:
+        - the number of buyers of each auction, drawn from a count distribution
+        - the number of bids of each buyer, drawn from a count distribution,
+        with an explicit probability for a buyer to place no bid
+        - the bid values, drawn from a lognormal distribution relative to the
+        reserve price
+        - optional tie injection: bids copying the value of a bid from another
+        buyer of the same auction
+        - optional timestamped bid streams for the DynamicAuction
+
+    Two generators built with the same parameters generate the same workload.
+    The columnar arrays can also be generated with numpy, loaded on first use
+    if installed.
+    """
+    COUNT_DISTRIBUTIONS = ("uniform", "zipf")
+
+    def __init__(self,
+                 seed: int = 0,
+                 reserve_price: float = 100.0,
+                 max_buyers: int = 10,
+                 buyers_distribution: str = "zipf",
+                 max_bids_per_buyer: int = 5,
+                 bids_distribution: str = "uniform",
+                 empty_buyer_ratio: float = 0.1,
+                 zipf_exponent: float = 1.2,
+                 bid_mu: float = 0.0,
+                 bid_sigma: float = 0.2,
+                 bid_precision: int = 2,
+                 tie_ratio: float = 0.0,
+                 mean_inter_arrival: float = 0.001):
+        """
+        Constructor.
+        Check parameters' format and raise BadFormatException accordingly.
+
+        :param seed: int, seed of the random generator
+        :param reserve_price: float, reserve price of the generated auctions
+        :param max_buyers: int, maximum number of buyers of an auction (at
+        least 1 buyer is generated)
+        :param buyers_distribution: str, distribution of the number of buyers,
+        one of COUNT_DISTRIBUTIONS
+        :param max_bids_per_buyer: int, maximum number of bids of a buyer
+        :param bids_distribution: str, distribution of the number of bids of a
+        buyer placing bids (1 to max_bids_per_buyer), one of
+        COUNT_DISTRIBUTIONS
+        :param empty_buyer_ratio: float, probability for a buyer to place no
+        bid
+        :param zipf_exponent: float, exponent of the zipf distributions
+        :param bid_mu: float, mean of the log of bid / reserve_price
+        :param bid_sigma: float, standard deviation of the log of
+        bid / reserve_price
+        :param bid_precision: int, number of decimals of the bid values
+        :param tie_ratio: float, probability for a bid to copy the value of a
+        bid from another buyer of the same auction
+        :param mean_inter_arrival: float, mean time (seconds) between two bids
+        of a bid stream
+        """
+        if not is_valid_int(seed):
+            raise BadFormatException("seed should be an int.")
+        if not isinstance(reserve_price, float) or reserve_price < 0:
+            raise BadFormatException(
+                "reserve_price should be a positive float.")
+        if not is_valid_int(max_buyers) or max_buyers <= 0:
+            raise BadFormatException(
+                "max_buyers should be a strictly positive int.")
+        if not is_valid_int(max_bids_per_buyer) or max_bids_per_buyer <= 0:
+            raise BadFormatException(
+                "max_bids_per_buyer should be a strictly positive int.")
+        if buyers_distribution not in WorkloadGenerator.COUNT_DISTRIBUTIONS \
+                or bids_distribution not in \
+                WorkloadGenerator.COUNT_DISTRIBUTIONS:
+            raise BadFormatException(
+                "distributions should be one of {}.".format(
+                    WorkloadGenerator.COUNT_DISTRIBUTIONS))
+        if not is_valid_number(zipf_exponent) or zipf_exponent < 0:
+            raise BadFormatException(
+                "zipf_exponent should be a positive number.")
+        if not is_valid_number(bid_mu):
+            raise BadFormatException("bid_mu should be a number.")
+        if not is_valid_number(bid_sigma) or bid_sigma < 0:
+            raise BadFormatException("bid_sigma should be a positive number.")
+        if not is_valid_int(bid_precision) or bid_precision < 0:
+            raise BadFormatException("bid_precision should be a positive int.")
+        for name, ratio in (("empty_buyer_ratio", empty_buyer_ratio),
+                            ("tie_ratio", tie_ratio)):
+            if not is_valid_number(ratio) or not 0.0 <= ratio <= 1.0:
+                raise BadFormatException(
+                    "{} should be a number in [0, 1].".format(name))
+        if not is_valid_number(mean_inter_arrival) or mean_inter_arrival <= 0:
+            raise BadFormatException(
+                "mean_inter_arrival should be a strictly positive number.")
+
+        self.seed = seed
+        self.reserve_price = reserve_price
+        self.empty_buyer_ratio = empty_buyer_ratio
+        self.bid_mu = bid_mu
+        self.bid_sigma = bid_sigma
+        self.bid_precision = bid_precision
+        self.tie_ratio = tie_ratio
+        self.mean_inter_arrival = mean_inter_arrival
+        self.rng = random.Random(seed)
+        # numpy random generator, created on first vectorized generation
+        self.numpy_rng = None
+
+        # Precompute the (population, cumulative weights) of the count
+        # distributions, so each draw is a single call to rng.choices
+        self.buyers_counts = WorkloadGenerator.get_count_distribution(
+            buyers_distribution, 1, max_buyers, zipf_exponent)
+        self.bids_counts = WorkloadGenerator.get_count_distribution(
+            bids_distribution, 1, max_bids_per_buyer, zipf_exponent)
+
+    @staticmethod
+    def get_count_distribution(distribution: str, low: int, high: int,
+                               zipf_exponent: float) -> \
+            Tuple[List[int], List[float]]:
+        """
+        Return the population [low, ..., high] and its cumulative weights for
+        the given distribution:
+            - uniform: all counts are equally likely
+            - zipf: count c has weight (c - low + 1) ** -zipf_exponent
+
+        :param distribution: str, one of COUNT_DISTRIBUTIONS
+        :param low: int, lowest count
+        :param high: int, highest count
+        :param zipf_exponent: float
+        :return: Tuple[List[int], List[float]]
+        """
+        population = list(range(low, high + 1))
+        if distribution == "zipf":
+            weights = [(c - low + 1) ** -zipf_exponent for c in population]
+        else:
+            weights = [1.0] * len(population)
+        return population, list(accumulate(weights))
+
+    def draw_counts(self, counts: Tuple[List[int], List[float]],
+                    k: int) -> List[int]:
+        """
+        Draw k counts from the precomputed count distribution.
+
+        :param counts: Tuple[List[int], List[float]], population and
+        cumulative weights
+        :param k: int, number of draws
+        :return: List[int]
+        """
+        population, cum_weights = counts
+        return self.rng.choices(population, cum_weights=cum_weights, k=k)
+
+    def draw_bids_per_buyer(self, nb_buyers: int) -> List[int]:
+        """
+        Draw the number of bids of nb_buyers buyers: 0 with probability
+        empty_buyer_ratio, else drawn from the bids count distribution.
+
+        :param nb_buyers: int
+        :return: List[int]
+        """
+        bids_per_buyer = self.draw_counts(self.bids_counts, nb_buyers)
+        if self.empty_buyer_ratio > 0:
+            rng = self.rng
+            bids_per_buyer = [
+                0 if rng.random() < self.empty_buyer_ratio else nb_bids
+                for nb_bids in bids_per_buyer
+            ]
+        return bids_per_buyer
+
+    def draw_bid_values(self, nb_bids: int) -> List[float]:
+        """
+        Draw nb_bids bid values: reserve_price * lognormal(bid_mu, bid_sigma),
+        rounded to bid_precision decimals.
+
+        :param nb_bids: int
+        :return: List[float]
+        """
+        rng = self.rng
+        return [
+            round(self.reserve_price * rng.lognormvariate(self.bid_mu,
+                                                          self.bid_sigma),
+                  self.bid_precision)
+            for _ in range(nb_bids)
+        ]
+
+    def inject_ties(self, values: List[float],
+                    bids_per_buyer: List[int]) -> None:
+        """
+        Replace, with probability tie_ratio, each bid value by the drawn value
+        of a bid from another buyer of the same auction, so ties happen
+        between buyers.
+        Bids of the auction are stored buyer by buyer in values.
+
+        :param values: List[float], bid values of the auction, updated in place
+        :param bids_per_buyer: List[int], number of bids of each buyer
+        :return:
+        """
+        rng = self.rng
+        drawn_values = list(values)
+        start = 0
+        for nb_bids in bids_per_buyer:
+            # Bids of the other buyers are drawn_values without the
+            # [start, start + nb_bids) range of the current buyer
+            nb_other_bids = len(values) - nb_bids
+            if nb_other_bids > 0:
+                for i in range(start, start + nb_bids):
+                    if rng.random() < self.tie_ratio:
+                        source = rng.randrange(nb_other_bids)
+                        if source >= start:
+                            source += nb_bids
+                        values[i] = drawn_values[source]
+            start += nb_bids
+
+    def generate_list_buyers_bids(self) -> List[List[float]]:
+        """
+        Generate the list of buyers, each buyer being represented by the list
+        of its bids.
+
+        :return: List[List[float]]
+        """
+        nb_buyers = self.draw_counts(self.buyers_counts, 1)[0]
+        bids_per_buyer = self.draw_bids_per_buyer(nb_buyers)
+        values = self.draw_bid_values(sum(bids_per_buyer))
+        if self.tie_ratio > 0:
+            self.inject_ties(values, bids_per_buyer)
+
+        list_buyers_bids = []
+        start = 0
+        for nb_bids in bids_per_buyer:
+            list_buyers_bids.append(values[start:start + nb_bids])
+            start += nb_bids
+        return list_buyers_bids
+
+    def generate_auction(self) -> Auction:
+        """
+        Generate one auction.
+
+        :return: Auction
+        """
+        return Auction(self.reserve_price, self.generate_list_buyers_bids())
+
+    def generate_auctions(self, nb_auctions: int) -> Iterator[Auction]:
+        """
+        Lazily generate nb_auctions auctions.
+
+        :param nb_auctions: int
+        :return: Iterator[Auction]
+        """
+        for _ in range(nb_auctions):
+            yield self.generate_auction()
+
+    def generate_columns(self, nb_auctions: int,
+                         vectorized: Optional[bool] = None) -> \
+            Tuple[Sequence[int], Sequence[int], Sequence[float]]:
+        """
+        Generate nb_auctions auctions as columnar arrays, one row per bid:
+            - auction index
+            - buyer index within the auction
+            - bid value
+
+        With numpy (vectorized), all the counts and values are drawn at once
+        and numpy arrays are returned. Otherwise the auctions are generated
+        one by one, as generate_auctions does, into array objects (signed long
+        indices, double values). Both are deterministic for a given seed, but
+        generate different workloads.
+
+        :param nb_auctions: int
+        :param vectorized: Optional[bool], use numpy, defaults to True if numpy
+        is installed
+        :return: Tuple[Sequence[int], Sequence[int], Sequence[float]]
+        """
+        numpy = None
+        if vectorized is not False:
+            numpy = import_optional("numpy")
+            if vectorized and numpy is None:
+                raise ImportError("numpy is required for vectorized columns.")
+        if numpy is not None:
+            return self.generate_columns_numpy(numpy, nb_auctions)
+
+        auction_ids, buyer_ids, bids = array("l"), array("l"), array("d")
+        for auction_id in range(nb_auctions):
+            for buyer_id, sublist_bids in enumerate(
+                    self.generate_list_buyers_bids()):
+                auction_ids.extend([auction_id] * len(sublist_bids))
+                buyer_ids.extend([buyer_id] * len(sublist_bids))
+                bids.extend(sublist_bids)
+        return auction_ids, buyer_ids, bids
+
+    def draw_counts_numpy(self, numpy, counts: Tuple[List[int], List[float]],
+                          k: int):
+        """
+        Draw k counts from the precomputed count distribution, with numpy.
+
+        :param numpy: numpy module
+        :param counts: Tuple[List[int], List[float]], population and
+        cumulative weights
+        :param k: int, number of draws
+        :return: numpy.ndarray of int64
+        """
+        population, cum_weights = counts
+        draws = self.numpy_rng.random(k) * cum_weights[-1]
+        # Clip as rounding may give draws equal to the total weight
+        indices = numpy.minimum(
+            numpy.searchsorted(cum_weights, draws, side="right"),
+            len(population) - 1)
+        return numpy.asarray(population, dtype=numpy.int64)[indices]
+
+    def generate_columns_numpy(self, numpy, nb_auctions: int):
+        """
+        Generate nb_auctions auctions as columnar numpy arrays (see
+        generate_columns), drawing all the counts and values at once.
+
+        :param numpy: numpy module
+        :param nb_auctions: int
+        :return: Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        """
+        if self.numpy_rng is None:
+            self.numpy_rng = numpy.random.default_rng(self.seed)
+        rng = self.numpy_rng
+
+        # One row per buyer
+        nb_buyers = self.draw_counts_numpy(numpy, self.buyers_counts,
+                                           nb_auctions)
+        buyers_start = numpy.cumsum(nb_buyers) - nb_buyers
+        buyer_auction_ids = numpy.repeat(
+            numpy.arange(nb_auctions, dtype=numpy.int64), nb_buyers)
+        buyer_ids = numpy.arange(len(buyer_auction_ids), dtype=numpy.int64) \
+            - numpy.repeat(buyers_start, nb_buyers)
+        bids_per_buyer = self.draw_counts_numpy(numpy, self.bids_counts,
+                                                len(buyer_auction_ids))
+        bids_per_buyer[
+            rng.random(len(bids_per_buyer)) < self.empty_buyer_ratio] = 0
+
+        # One row per bid
+        auction_ids = numpy.repeat(buyer_auction_ids, bids_per_buyer)
+        bid_buyer_ids = numpy.repeat(buyer_ids, bids_per_buyer)
+        bids = numpy.round(
+            self.reserve_price * rng.lognormal(self.bid_mu, self.bid_sigma,
+                                               len(auction_ids)),
+            self.bid_precision)
+
+        if self.tie_ratio > 0 and len(bids) > 0:
+            # Bids of an auction are in [auction_start, auction_start +
+            # bids_per_auction), bids of a buyer in [buyer_start, buyer_start
+            # + buyer_nb_bids)
+            bids_per_auction = numpy.add.reduceat(bids_per_buyer,
+                                                  buyers_start)
+            auction_start = numpy.cumsum(bids_per_auction) - bids_per_auction
+            buyer_start = numpy.cumsum(bids_per_buyer) - bids_per_buyer
+            nb_bids = numpy.repeat(bids_per_buyer, bids_per_buyer)
+            nb_other_bids = bids_per_auction[auction_ids] - nb_bids
+
+            ties = (rng.random(len(bids)) < self.tie_ratio) & \
+                (nb_other_bids > 0)
+            # Draw a bid among the other buyers' bids, skipping the range of
+            # the current buyer
+            sources = auction_start[auction_ids[ties]] + (
+                    rng.random(numpy.count_nonzero(ties))
+                    * nb_other_bids[ties]).astype(numpy.int64)
+            bid_buyer_start = numpy.repeat(buyer_start, bids_per_buyer)[ties]
+            sources = numpy.where(sources >= bid_buyer_start,
+                                  sources + nb_bids[ties], sources)
+            bids[ties] = bids[sources]
+
+        return auction_ids, bid_buyer_ids, bids
+
+    def write_jsonl(self, nb_auctions: int, file: TextIO) -> None:
+        """
+        Write nb_auctions auctions to file, one JSON object per line:
+            {"reserve_price": float, "list_buyers_bids": List[List[float]]}
+
+        :param nb_auctions: int
+        :param file: TextIO
+        :return:
+        """
+        for _ in range(nb_auctions):
+            file.write(json.dumps({
+                "reserve_price": self.reserve_price,
+                "list_buyers_bids": self.generate_list_buyers_bids()
+            }))
+            file.write("\n")
+
+    def generate_bid_stream(self, auction: Auction,
+                            start_time: float = 0.0) -> \
+            List[Tuple[float, Bid]]:
+        """
+        Return the bids of the auction as a timestamped stream of
+        (timestamp, Bid) tuples, in ascending order of the timestamp, to be
+        placed in a DynamicAuction.
+        Bids of all buyers are shuffled, and inter-arrival times are drawn from
+        an exponential distribution of mean mean_inter_arrival.
+
+        :param auction: Auction
+        :param start_time: float, timestamp (seconds) of the stream start
+        :return: List[Tuple[float, Bid]]
+        """
+        rng = self.rng
+        bids = [
+            Bid(buyer_id, bid)
+            for buyer_id, bid in auction.get_flat_list_tuples()
+        ]
+        rng.shuffle(bids)
+
+        stream = []
+        timestamp = start_time
+        for bid in bids:
+            timestamp += rng.expovariate(1.0 / self.mean_inter_arrival)
+            stream.append((timestamp, bid))
+        return stream
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Write a synthetic auction workload as JSONL on stdout.")
+    parser.add_argument("--nb-auctions", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reserve-price", type=float, default=100.0)
+    parser.add_argument("--max-buyers", type=int, default=10)
+    parser.add_argument("--buyers-distribution", default="zipf",
+                        choices=WorkloadGenerator.COUNT_DISTRIBUTIONS)
+    parser.add_argument("--max-bids-per-buyer", type=int, default=5)
+    parser.add_argument("--bids-distribution", default="uniform",
+                        choices=WorkloadGenerator.COUNT_DISTRIBUTIONS)
+    parser.add_argument("--empty-buyer-ratio", type=float, default=0.1)
+    parser.add_argument("--zipf-exponent", type=float, default=1.2)
+    parser.add_argument("--bid-mu", type=float, default=0.0)
+    parser.add_argument("--bid-sigma", type=float, default=0.2)
+    parser.add_argument("--bid-precision", type=int, default=2)
+    parser.add_argument("--tie-ratio", type=float, default=0.0)
+    args = parser.parse_args()
+
+    WorkloadGenerator(
+        seed=args.seed,
+        reserve_price=args.reserve_price,
+        max_buyers=args.max_buyers,
+        buyers_distribution=args.buyers_distribution,
+        max_bids_per_buyer=args.max_bids_per_buyer,
+        bids_distribution=args.bids_distribution,
+        empty_buyer_ratio=args.empty_buyer_ratio,
+        zipf_exponent=args.zipf_exponent,
+        bid_mu=args.bid_mu,
+        bid_sigma=args.bid_sigma,
+        bid_precision=args.bid_precision,
+        tie_ratio=args.tie_ratio
+    ).write_jsonl(args.nb_auctions, sys.stdout)